@@ -31,6 +31,11 @@ Options:
   --build-dir DIR        Build directory (default: build/)
   --iree-source-dir DIR  IREE source directory
   --target TARGET        Build target (default: all)
+  --parallel N           Number of parallel build jobs (default: \$(nproc))
+  --link-jobs N          Max number of concurrent link jobs (default: unlimited)
+  --ccache               Cache compiler outputs with ccache, or sccache if
+                         ccache is not installed (default: off)
+  --lld                  Link with lld instead of the default linker (default: off)
 
 Extra cmake options can be passed after '--'.
 EOF
@@ -48,6 +53,10 @@ SOURCE_DIR="${REPO_ROOT}"
 BUILD_DIR="build"
 IREE_SOURCE_DIR=""
 TARGET="all"
+PARALLEL="$(nproc)"
+LINK_JOBS=""
+USE_CCACHE=false
+USE_LLD=false
 EXTRA_CMAKE_OPTIONS=()
 
 while [[ $# -gt 0 ]]; do
@@ -68,6 +77,22 @@ while [[ $# -gt 0 ]]; do
       TARGET="$2"
       shift 2
       ;;
+    --parallel)
+      PARALLEL="$2"
+      shift 2
+      ;;
+    --link-jobs)
+      LINK_JOBS="$2"
+      shift 2
+      ;;
+    --ccache)
+      USE_CCACHE=true
+      shift
+      ;;
+    --lld)
+      USE_LLD=true
+      shift
+      ;;
     --)
       shift
       EXTRA_CMAKE_OPTIONS+=("$@")
@@ -218,10 +243,47 @@ case "${CONFIG}" in
     ;;
 esac
 
+if [[ "${USE_CCACHE}" == "true" ]]; then
+  if command -v ccache >/dev/null; then
+    COMPILER_LAUNCHER=ccache
+  elif command -v sccache >/dev/null; then
+    COMPILER_LAUNCHER=sccache
+  else
+    echo "--ccache was specified but neither ccache nor sccache is installed"
+    exit 1
+  fi
+  CMAKE_OPTIONS+=(
+    "-DCMAKE_C_COMPILER_LAUNCHER=${COMPILER_LAUNCHER}"
+    "-DCMAKE_CXX_COMPILER_LAUNCHER=${COMPILER_LAUNCHER}"
+  )
+else
+  # Drop launchers cached by a previous --ccache configure of this build dir.
+  CMAKE_OPTIONS+=("-UCMAKE_C_COMPILER_LAUNCHER" "-UCMAKE_CXX_COMPILER_LAUNCHER")
+fi
+
+# lld links multi-threaded and is much faster than ld.bfd on the large
+# Debug/ASAN test binaries.
+if [[ "${USE_LLD}" == "true" ]]; then
+  CMAKE_OPTIONS+=("-DFUSILLI_USE_LLD=ON")
+else
+  CMAKE_OPTIONS+=("-DFUSILLI_USE_LLD=OFF")
+fi
+
+if [[ -n "${LINK_JOBS}" ]]; then
+  # Link steps of Debug/ASAN binaries are memory hungry; a Ninja job pool caps
+  # how many run at once without limiting compile parallelism.
+  CMAKE_OPTIONS+=(
+    "-DCMAKE_JOB_POOLS=link=${LINK_JOBS}"
+    -DCMAKE_JOB_POOL_LINK=link
+  )
+else
+  CMAKE_OPTIONS+=("-UCMAKE_JOB_POOLS" "-UCMAKE_JOB_POOL_LINK")
+fi
+
 CMAKE_OPTIONS+=("${EXTRA_CMAKE_OPTIONS[@]+"${EXTRA_CMAKE_OPTIONS[@]}"}")
 
 echo "=== Fusilli build: config=${CONFIG} ==="
 echo "=== CMake options: ${CMAKE_OPTIONS[*]} ==="
 
 cmake "${CMAKE_OPTIONS[@]}"
-cmake --build "${BUILD_DIR}" --target "${TARGET}"
+cmake --build "${BUILD_DIR}" --target "${TARGET}" --parallel "${PARALLEL}"
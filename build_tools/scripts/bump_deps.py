@@ -30,6 +30,8 @@ Environment variable outputs (via GITHUB_ENV when running in CI):
 """
 
 import argparse
+import functools
+import hashlib
 import json
 import os
 import re
@@ -37,13 +39,36 @@ import subprocess
 import sys
 import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent
 VERSION_JSON_PATH = REPO_ROOT / "version.json"
+HTTP_CACHE_DIR = Path.home() / ".cache" / "fusilli-bump-deps"
 IREE_PIP_RELEASE_LINKS_URL = "https://iree.dev/pip-release-links.html"
 THEROCK_CDN_BASE_URL = "https://rocm.nightlies.amd.com/tarball"
+# Newest IREE tags, sorted server-side. Only the latest two rc tags are ever
+# candidates, so a single page comfortably covers them.
+IREE_TAGS_GRAPHQL_QUERY = """
+{
+  repository(owner: "iree-org", name: "iree") {
+    refs(
+      refPrefix: "refs/tags/"
+      query: "iree-"
+      first: 50
+      orderBy: {field: TAG_COMMIT_DATE, direction: DESC}
+    ) {
+      nodes {
+        name
+      }
+    }
+  }
+}
+"""
+# Matches wheel file names on the pip release links page, capturing the version,
+# e.g. ``iree_base_compiler-3.11.0rc20260301-cp311-...whl``.
+IREE_WHEEL_NAME_RE = re.compile(r"\biree_base_compiler-([^-\"/]+)-[^\"/]*\.whl")
 
 
 def read_version_json() -> dict:
@@ -68,46 +93,152 @@ def _version_sort_key(version_str: str):
     return (int(m.group(1)), int(m.group(2)), int(m.group(3)), int(m.group(4)))
 
 
-def verify_iree_wheel(version: str) -> bool:
-    """Verify that the iree-base-compiler wheel is available for the given version.
+def _url_exists(url: str, timeout: float) -> bool:
+    """Return whether *url* is served, without downloading its body.
 
-    The pip release links page uses underscores in package names
-    (``iree_base_compiler-VERSION``).
+    Sends a HEAD request, falling back to a GET for servers that reject HEAD.
+    Both carry a single-byte ``Range`` header: urllib turns HEAD into GET when
+    following redirects, and the range keeps that GET from pulling the body.
     """
-    print(f"Verifying iree-base-compiler wheel availability for {version}...")
+    headers = {"Range": "bytes=0-0"}
     try:
-        with urllib.request.urlopen(IREE_PIP_RELEASE_LINKS_URL, timeout=30) as resp:
-            content = resp.read().decode("utf-8")
-    except urllib.error.URLError as e:
-        print(f"WARNING: Failed to fetch pip release links: {e}", file=sys.stderr)
+        req = urllib.request.Request(url, headers=headers, method="HEAD")
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status in (200, 206)
+    except urllib.error.HTTPError as e:
+        if e.code not in (405, 501):
+            return False
+    except (urllib.error.URLError, TimeoutError):
+        return False
+
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status in (200, 206)
+    except (urllib.error.URLError, TimeoutError):
         return False
 
-    needle = f"iree_base_compiler-{version}"
-    found = needle in content
+
+def _cached_get(url: str, timeout: float) -> str:
+    """GET *url*, revalidating against the copy saved by a previous run.
+
+    Responses are stored under ``HTTP_CACHE_DIR`` with their ``ETag`` and
+    ``Last-Modified`` validators, which are sent back as ``If-None-Match`` and
+    ``If-Modified-Since``. A ``304 Not Modified`` reply is served from disk, so
+    an unchanged page costs a round-trip but no body transfer.
+
+    Raises:
+        urllib.error.URLError: If the request fails.
+    """
+    cache_path = HTTP_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        cached = None
+    # The cache is best-effort: anything that is not an entry we wrote is
+    # ignored and costs a full fetch.
+    if not (isinstance(cached, dict) and isinstance(cached.get("body"), str)):
+        cached = None
+
+    headers = {}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            body = resp.read().decode("utf-8")
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached is not None:
+            return cached["body"]
+        raise
+
+    if etag or last_modified:
+        entry = {"body": body, "etag": etag, "last_modified": last_modified}
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(entry))
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            print(f"WARNING: Failed to write HTTP cache: {e}", file=sys.stderr)
+    return body
+
+
+def _fetch_iree_release_index() -> str:
+    """Fetch the IREE pip release links page.
+
+    The page is read in full rather than streamed because the disk cache
+    stores the complete body to answer later 304 revalidations.
+
+    Raises:
+        urllib.error.URLError: If the page cannot be fetched.
+    """
+    return _cached_get(IREE_PIP_RELEASE_LINKS_URL, timeout=30)
+
+
+@functools.lru_cache(maxsize=1)
+def _iree_wheel_versions() -> frozenset[str]:
+    """Return the iree-base-compiler versions listed on the pip release links page.
+
+    The page lists every published wheel, so it is downloaded and parsed once
+    per run and shared by all wheel checks. The page uses underscores in
+    package names (``iree_base_compiler-VERSION-...whl``).
+
+    Raises:
+        urllib.error.URLError: If the page cannot be fetched.
+    """
+    return frozenset(IREE_WHEEL_NAME_RE.findall(_fetch_iree_release_index()))
+
+
+def verify_iree_wheel(version: str, log: list[str]) -> bool:
+    """Verify that the iree-base-compiler wheel is available for the given version.
+
+    Matches the exact wheel file name prefix on the pip release links page.
+    Progress messages are appended to *log* instead of printed, so concurrent
+    checks do not interleave their output.
+
+    Raises:
+        urllib.error.URLError: If the pip release links page cannot be fetched.
+    """
+    log.append(f"Verifying iree-base-compiler wheel availability for {version}...")
+    name = f"iree_base_compiler-{version}"
+    found = version in _iree_wheel_versions()
     if found:
-        print(f"  OK: {needle} is available")
+        log.append(f"  OK: {name} is available")
     else:
-        print(f"  MISSING: {needle} is NOT available")
+        log.append(f"  MISSING: {name} is NOT available")
     return found
 
 
-def find_latest_iree_with_wheel() -> str:
+def find_latest_iree_with_wheel(current_version: str) -> str:
     """Find the latest IREE version that has a published pip wheel.
 
-    Uses the GitHub git tags API (NOT releases API, which misses rc tags) to
-    discover all IREE rc tags, then verifies wheel availability on the pip
-    release links page. Falls back to the second-latest tag if the latest
-    wheel is not yet available.
+    Uses a single GitHub GraphQL query over git tags (NOT releases, which miss
+    rc tags) that returns only the most recently committed ``iree-*`` tags,
+    then verifies wheel availability on the pip release links page. Falls
+    back to the second-latest tag if the latest wheel is not yet available.
+
+    Args:
+        current_version: Current IREE version string from version.json. Its
+            wheel is already in use, so it is never re-verified.
     """
-    print("Querying IREE git tags via GitHub API...")
+    print("Querying IREE git tags via GitHub GraphQL API...")
     result = subprocess.run(
         [
             "gh",
             "api",
-            "repos/iree-org/iree/git/refs/tags",
-            "--jq",
-            ".[].ref",
-            "--paginate",
+            "graphql",
+            "-f",
+            f"query={IREE_TAGS_GRAPHQL_QUERY}",
+            # Reuse the response for repeated runs within the hour.
+            "--cache",
+            "1h",
         ],
         capture_output=True,
         text=True,
@@ -116,9 +247,15 @@ def find_latest_iree_with_wheel() -> str:
         print(f"ERROR: gh api failed: {result.stderr}", file=sys.stderr)
         sys.exit(1)
 
+    try:
+        nodes = json.loads(result.stdout)["data"]["repository"]["refs"]["nodes"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"ERROR: Unexpected gh api response: {e}", file=sys.stderr)
+        sys.exit(1)
+
     rc_versions = []
-    for line in result.stdout.strip().splitlines():
-        m = re.match(r"refs/tags/iree-(\d+\.\d+\.\d+rc\d+)$", line)
+    for node in nodes:
+        m = re.match(r"iree-(\d+\.\d+\.\d+rc\d+)$", node["name"])
         if m:
             rc_versions.append(m.group(1))
 
@@ -129,44 +266,69 @@ def find_latest_iree_with_wheel() -> str:
     rc_versions.sort(key=_version_sort_key)
     print(f"Found {len(rc_versions)} rc tags, latest: {rc_versions[-1]}")
 
-    # Try latest first, then fall back to second-latest.
+    # Nothing newer than the pinned version: no need to touch the network.
+    if rc_versions[-1] == current_version:
+        print(f"  OK: {current_version} is the current version")
+        return current_version
+
+    # Verify the latest and second-latest tags concurrently, preferring the
+    # latest. The release index is fetched up front so both checks share it.
     candidates = rc_versions[-2:][::-1]
+    available = {c: True for c in candidates if c == current_version}
+    to_verify = [c for c in candidates if c not in available]
+    logs = {c: [] for c in to_verify}
+    try:
+        _iree_wheel_versions()
+        with ThreadPoolExecutor(max_workers=len(to_verify)) as executor:
+            futures = {
+                executor.submit(verify_iree_wheel, c, logs[c]): c for c in to_verify
+            }
+            available.update({futures[f]: f.result() for f in as_completed(futures)})
+    except urllib.error.URLError as e:
+        print(f"ERROR: Failed to fetch pip release links: {e}", file=sys.stderr)
+        sys.exit(1)
+    print("\n".join(line for c in to_verify for line in logs[c]))
+
     for candidate in candidates:
-        if verify_iree_wheel(candidate):
+        if available[candidate]:
             return candidate
-        print(f"  Wheel not available for {candidate}, trying fallback...")
+        print(f"  Wheel not available for {candidate}, falling back...")
 
     print("ERROR: No IREE version with available wheel found", file=sys.stderr)
     sys.exit(1)
 
 
+def _therock_tarball_exists(candidate: str) -> bool:
+    """Return whether the TheRock CDN serves a tarball for *candidate*."""
+    url = f"{THEROCK_CDN_BASE_URL}/therock-dist-linux-gfx94X-dcgpu-{candidate}.tar.gz"
+    return _url_exists(url, timeout=15)
+
+
 def _probe_therock_cdn(prefix: str, num_days: int = 3) -> str | None:
     """Probe the TheRock CDN for the latest available date with *prefix*.
 
-    Checks *num_days* most recent dates (today, yesterday, …).
+    Checks the *num_days* most recent dates (today, yesterday, …). The HEAD
+    requests are independent, so they are issued concurrently and the newest
+    date that is available wins.
 
     Returns:
         The full version string (e.g., ``7.13.0a20260315``) if found, or
         ``None`` if nothing is available.
     """
     today = datetime.now(timezone.utc)
-    for days_ago in range(num_days):
-        date = today - timedelta(days=days_ago)
-        date_str = date.strftime("%Y%m%d")
-        candidate = f"{prefix}{date_str}"
-        url = (
-            f"{THEROCK_CDN_BASE_URL}/"
-            f"therock-dist-linux-gfx94X-dcgpu-{candidate}.tar.gz"
-        )
-        print(f"Checking TheRock CDN: {candidate}...")
-        try:
-            req = urllib.request.Request(url, method="HEAD")
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                if resp.status == 200:
-                    print(f"  FOUND: {candidate}")
-                    return candidate
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            continue
+    candidates = [
+        f"{prefix}{(today - timedelta(days=days_ago)).strftime('%Y%m%d')}"
+        for days_ago in range(num_days)
+    ]
+    print(f"Checking TheRock CDN: {', '.join(candidates)}...")
+    with ThreadPoolExecutor(max_workers=num_days) as executor:
+        available = list(executor.map(_therock_tarball_exists, candidates))
+
+    # Candidates are ordered newest to oldest.
+    for candidate, found in zip(candidates, available):
+        if found:
+            print(f"  FOUND: {candidate}")
+            return candidate
     return None
 
 
@@ -269,7 +431,7 @@ def main() -> int:
     # 2. Discover latest versions.
     if not args.therock_only:
         print(f"\n{'─' * 72}")
-        latest_iree = find_latest_iree_with_wheel()
+        latest_iree = find_latest_iree_with_wheel(current_iree)
     else:
         latest_iree = current_iree
 